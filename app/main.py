@@ -1,26 +1,32 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+import asyncio
 import os
-import aiofiles
+from concurrent.futures import ThreadPoolExecutor
 from app.models import KTPResponse, ErrorResponse
 from app.services.smart_ocr_service import SmartOCRService
 from app.services.ktp_extractor import KTPExtractor
 from app.services.signature_extractor import SignatureExtractorService
 from app.utils.helpers import (
-    is_allowed_file, 
-    validate_file_size, 
-    generate_unique_filename,
-    validate_image,
-    cleanup_temp_file
+    is_allowed_file,
+    validate_file_size,
+    validate_image_bytes
 )
-from config.settings import TEMP_DIR
 from pydantic import BaseModel
 from typing import Optional
 
 app = FastAPI(
     title="KTP OCR & Signature Extraction API",
     description="API untuk ekstraksi data KTP dan tanda tangan",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
+)
+
+# Dedicated pool for OCR calls: Vision round-trips block for 300-800ms,
+# so keep them from queueing behind other work in the default executor
+ocr_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("OCR_CONCURRENCY", "16")),
+    thread_name_prefix="ocr"
 )
 
 # Initialize services
@@ -35,6 +41,21 @@ class SignatureResponse(BaseModel):
     confidence: Optional[float] = None
     dimensions: Optional[dict] = None
 
+async def read_upload(file: UploadFile) -> bytes:
+    """Read upload in chunks so oversized bodies are rejected early instead of buffered whole"""
+    buf = bytearray()
+    while True:
+        chunk = await file.read(65536)
+        if not chunk:
+            break
+        buf.extend(chunk)
+        if not validate_file_size(len(buf)):
+            raise HTTPException(
+                status_code=413,
+                detail="File size too large. Maximum 10MB allowed"
+            )
+    return bytes(buf)
+
 @app.post("/extract-ktp", response_model=KTPResponse)
 async def extract_ktp(file: UploadFile = File(...)):
     """
@@ -43,8 +64,6 @@ async def extract_ktp(file: UploadFile = File(...)):
     - **file**: Image file (JPG, JPEG, PNG)
     - Returns: Extracted KTP data including NIK, name, address, etc.
     """
-    temp_file_path = None
-    
     try:
         # Validate file
         if not file.filename:
@@ -56,32 +75,20 @@ async def extract_ktp(file: UploadFile = File(...)):
                 detail="File type not allowed. Supported: jpg, jpeg, png"
             )
         
-        # Read file
-        contents = await file.read()
-        file_size = len(contents)
-        
-        if not validate_file_size(file_size):
-            raise HTTPException(
-                status_code=400, 
-                detail="File size too large. Maximum 10MB allowed"
-            )
-        
-        # Save temporarily
-        temp_filename = generate_unique_filename(file.filename)
-        temp_file_path = os.path.join(TEMP_DIR, temp_filename)
-        
-        async with aiofiles.open(temp_file_path, 'wb') as f:
-            await f.write(contents)
-        
-        # Validate image
-        if not validate_image(temp_file_path):
+        # Read file in chunks with size guard
+        contents = await read_upload(file)
+
+        # Validate image (no temp file needed, OCR works on bytes)
+        if not validate_image_bytes(contents):
             raise HTTPException(status_code=400, detail="Invalid image file")
-        
-        # Extract text using Google Vision
-        ocr_result = ocr_service.extract_text(temp_file_path)
-        
-        # Extract KTP data
-        ktp_data = ktp_extractor.extract_ktp_data(ocr_result)
+
+        # Extract text using Google Vision (blocking call, keep it off the event loop)
+        ocr_result = await asyncio.get_running_loop().run_in_executor(
+            ocr_executor, ocr_service.extract_text_from_bytes, contents
+        )
+
+        # Extract KTP data (CPU-bound)
+        ktp_data = await asyncio.to_thread(ktp_extractor.extract_ktp_data, ocr_result)
         
         # Validate NIK
         if not ktp_data.nik:
@@ -105,10 +112,6 @@ async def extract_ktp(file: UploadFile = File(...)):
             message=f"Processing failed: {str(e)}",
             data=None
         )
-    
-    finally:
-        if temp_file_path:
-            cleanup_temp_file(temp_file_path)
 
 @app.post("/extract-signature", response_model=SignatureResponse)
 async def extract_signature(file: UploadFile = File(...)):
@@ -131,18 +134,12 @@ async def extract_signature(file: UploadFile = File(...)):
                 detail="File type not allowed. Supported: jpg, jpeg, png"
             )
         
-        # Read file
-        contents = await file.read()
-        file_size = len(contents)
-        
-        if not validate_file_size(file_size):
-            raise HTTPException(
-                status_code=400, 
-                detail="File size too large. Maximum 10MB allowed"
-            )
-        
-        # Process directly from bytes (no need to save file)
-        result = signature_service.extract_and_upload(image_bytes=contents)
+        # Read file in chunks with size guard
+        contents = await read_upload(file)
+
+        # Process directly from bytes (no need to save file); runs in a
+        # thread so the CDN upload doesn't block the event loop
+        result = await asyncio.to_thread(signature_service.extract_and_upload, image_bytes=contents)
         
         return SignatureResponse(**result)
     
@@ -154,6 +151,15 @@ async def extract_signature(file: UploadFile = File(...)):
             message=f"Processing failed: {str(e)}"
         )
 
+@app.post("/warmup")
+async def warmup():
+    """Load OCR models so the first real request doesn't pay the cost"""
+    services = await asyncio.to_thread(ocr_service.warmup)
+    return {
+        "status": "warm",
+        "services": services
+    }
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -198,4 +204,12 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # import string (not the app object) so uvicorn can fork multiple workers
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WORKERS", "4")),
+        loop="uvloop",
+        http="httptools"
+    )
\ No newline at end of file
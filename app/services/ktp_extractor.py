@@ -5,16 +5,74 @@ from datetime import datetime
 from typing import Optional, Dict, List, Tuple
 from app.models import KTPData
 
-def levenshtein(source: str, target: str) -> int:
+# RapidFuzz's C implementation is 10-50x faster than the NumPy version
+# for the short keywords we match against
+try:
+    from rapidfuzz.distance import Levenshtein as _Levenshtein
+    from rapidfuzz import process as _rf_process
+except ImportError:
+    _Levenshtein = None
+    _rf_process = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+_DATE_RE = re.compile(r'(\d{1,2}-\d{1,2}-\d{4})')
+_TGL_RE = re.compile(r'[/\\]\s*[TtIi]gl\s*')
+_NON_DIGIT_RE = re.compile(r'\D+')
+_DIGIT_RE = re.compile(r'\d+')
+_NON_ALPHA_SPACE_RE = re.compile(r'[^A-Za-z\s]+')
+
+_BLOOD_TYPES = frozenset({'a', 'b', 'ab', 'o'})
+_FEMALE_LABELS = frozenset({'WANITA', 'PEREMPUAN'})
+_CERAI_STATUSES = ('janda', 'duda', 'cerai')
+_NAMA_EXCLUDED = frozenset({'jawa', 'nusa'})
+
+if numba is not None:
+    @numba.njit(cache=True, boundscheck=False)
+    def _lev_nb(source: bytes, target: bytes) -> int:
+        # single-row Wagner-Fischer over utf-8 bytes
+        n = len(target)
+        row = np.empty(n + 1, dtype=np.int32)
+        for j in range(n + 1):
+            row[j] = j
+
+        for i in range(len(source)):
+            prev = row[0]
+            row[0] = i + 1
+            for j in range(n):
+                cost = prev if source[i] == target[j] else prev + 1
+                prev = row[j + 1]
+                row[j + 1] = min(cost, prev + 1, row[j] + 1)
+
+        return row[n]
+else:
+    _lev_nb = None
+
+def levenshtein(source: str, target: str, score_cutoff: Optional[int] = None) -> int:
+    if _Levenshtein is not None:
+        return _Levenshtein.distance(source, target, score_cutoff=score_cutoff)
+
+    # the length gap alone is a lower bound on the distance, so skip the
+    # DP entirely for tokens that obviously cannot match
+    if score_cutoff is not None and abs(len(source) - len(target)) > score_cutoff:
+        return score_cutoff + 1
+
+    if _lev_nb is not None:
+        return int(_lev_nb(source.encode('utf-8'), target.encode('utf-8')))
+
+    # NumPy fallback when neither rapidfuzz nor numba is installed
     if len(source) < len(target):
         return levenshtein(target, source)
-    
+
     if len(target) == 0:
         return len(source)
-    
+
     source = np.array(tuple(source))
     target = np.array(tuple(target))
-    
+
     previous_row = np.arange(target.size + 1)
     for s in source:
         current_row = previous_row + 1
@@ -25,9 +83,51 @@ def levenshtein(source: str, target: str) -> int:
             current_row[1:],
             current_row[0:-1] + 1)
         previous_row = current_row
-    
+
     return previous_row[-1]
 
+def distance_matrix(keywords: List[str], tokens: List[str], score_cutoff: Optional[int] = None) -> np.ndarray:
+    """
+    Levenshtein distances between every keyword and every OCR token.
+
+    With score_cutoff set, distances above the cutoff come back as
+    cutoff + 1, which keeps min/argmin comparisons against a tolerance
+    <= cutoff intact while letting the scorer abort early.
+    """
+    if _rf_process is not None:
+        return _rf_process.cdist(keywords, tokens, scorer=_Levenshtein.distance,
+                                 score_cutoff=score_cutoff, dtype=np.int32)
+
+    return np.array([[levenshtein(kw, tok, score_cutoff=score_cutoff) for tok in tokens]
+                     for kw in keywords], dtype=np.int32)
+
+def _pop_closest(words: List[Dict], target: str, tolerance: int) -> bool:
+    """
+    Remove the word closest to target if within tolerance.
+
+    Single linear scan instead of building a distance list, np.argmin
+    and list.pop — np dispatch on 3-4 element lists costs more than the
+    scan itself.
+    """
+    best_idx = -1
+    best_dist = tolerance + 1
+    for i, word in enumerate(words):
+        dist = levenshtein(target, word['label_lower'], score_cutoff=tolerance)
+        if dist < best_dist:
+            best_dist = dist
+            best_idx = i
+
+    if best_idx >= 0:
+        del words[best_idx]
+        return True
+    return False
+
+def word_columns(ls_word: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parallel x1/y1 coordinate arrays for vectorized geometry checks"""
+    x1 = np.array([word['x1'] for word in ls_word], dtype=np.float64)
+    y1 = np.array([word['y1'] for word in ls_word], dtype=np.float64)
+    return x1, y1
+
 class KTPExtractor:
     def __init__(self):
         self.fields_config = [
@@ -63,6 +163,7 @@ class KTPExtractor:
                 
                 boxes = {
                     'label': text['description'],
+                    'label_lower': text['description'].lower(),
                     'x1': vertices[0].get('x', 0),
                     'y1': vertices[0].get('y', 0),
                     'x2': vertices[1].get('x', 0),
@@ -79,59 +180,61 @@ class KTPExtractor:
         return ls_word
     
     def calc_degree(self, x1: float, y1: float, x2: float, y2: float) -> float:
-        myradians = math.atan2(y1 - y2, x1 - x2)
-        mydegrees = math.degrees(myradians)
+        # 57.29577951308232 == 180/pi, inlined to skip the math.degrees call
+        mydegrees = math.atan2(y1 - y2, x1 - x2) * 57.29577951308232
         return mydegrees if mydegrees >= 0 else 360 + mydegrees
     
-    def get_attribute_ktp(self, ls_word: List[Dict], field_name: str, field_keywords: str, typo_tolerance: int) -> Optional[str]:
+    def get_attribute_ktp(self, ls_word: List[Dict], field_name: str, field_keywords: str, typo_tolerance: int, ls_dist: Optional[np.ndarray] = None, coords: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Optional[str]:
         if not ls_word:
             return None
-        
-        
+
+
         if field_name == 'nama':
-            ls_word = [word for word in ls_word if word['label'].lower() not in ['jawa', 'nusa']]
-        
-        
-        new_ls_word = [word['label'].lower() for word in ls_word]
-        ls_dist = [levenshtein(field_keywords, word) for word in new_ls_word]
-        
-        
-        if '/' in field_keywords:
-            alt_keywords = field_keywords.replace('/', ' ')
-            ls_dist_alt = [levenshtein(alt_keywords, word) for word in new_ls_word]
-            
-            for i in range(len(ls_dist)):
-                ls_dist[i] = min(ls_dist[i], ls_dist_alt[i])
-        
+            ls_word = [word for word in ls_word if word['label_lower'] not in _NAMA_EXCLUDED]
+            if not ls_word:
+                return None
+            # filtering shifts indices, so any precomputed arrays are stale
+            ls_dist = None
+            coords = None
+
+
+        if ls_dist is None:
+            new_ls_word = [word['label_lower'] for word in ls_word]
+            ls_dist = distance_matrix([field_keywords], new_ls_word, score_cutoff=typo_tolerance)[0]
+
+            if '/' in field_keywords:
+                alt_keywords = field_keywords.replace('/', ' ')
+                ls_dist = np.minimum(ls_dist, distance_matrix([alt_keywords], new_ls_word, score_cutoff=typo_tolerance)[0])
+
         if np.min(ls_dist) > typo_tolerance:
-            
+
             if field_name == 'kota' and field_keywords != 'kota':
-                return self.get_attribute_ktp(ls_word, field_name, 'kota', 1)
+                return self.get_attribute_ktp(ls_word, field_name, 'kota', 1, coords=coords)
             return None
-        
+
         index = np.argmin(ls_dist)
         x, y = ls_word[index]['x1'], ls_word[index]['y1']
-        degree = self.calc_degree(ls_word[index]['x1'], ls_word[index]['y1'], 
+        degree = self.calc_degree(ls_word[index]['x1'], ls_word[index]['y1'],
                                  ls_word[index]['x2'], ls_word[index]['y2'])
-        
-        
-        ls_y = [abs(y - word['y1']) < 300 for word in ls_word]
-        value_words = [ww for ww, val in zip(ls_word, ls_y) 
-                      if val and abs(self.calc_degree(x, y, ww['x1'], ww['y1']) - degree) < 3]
+
+
+        # one vectorized pass over all word coordinates instead of two
+        # atan2 calls per word per field
+        if coords is None:
+            coords = word_columns(ls_word)
+        X1, Y1 = coords
+
+        deg = np.degrees(np.arctan2(y - Y1, x - X1))
+        deg = np.where(deg < 0, deg + 360, deg)
+        mask = (np.abs(Y1 - y) < 300) & (np.abs(deg - degree) < 3)
+        value_words = [ls_word[i] for i in np.nonzero(mask)[0]]
         
         
         value_words = [val for val in value_words if len(val['label'].replace(' ', '').replace(':', '')) > 0]
         
         
-        d = [levenshtein('gol.', str(val['label']).lower()) for val in value_words]
-        if d and min(d) <= 1:
-            idx = np.argmin(d)
-            value_words.pop(idx)
-        
-        d = [levenshtein('darah', str(val['label']).lower()) for val in value_words]
-        if d and min(d) <= 1:
-            idx = np.argmin(d)
-            value_words.pop(idx)
+        _pop_closest(value_words, 'gol.', 1)
+        _pop_closest(value_words, 'darah', 1)
         
         
         if field_name == 'nik' and value_words:
@@ -147,15 +250,12 @@ class KTPExtractor:
         elif field_name == 'ttl':
             
             for keyword in ['lahir', 'tempat/tgl', 'tempat', 'tgl']:
-                d = [levenshtein(keyword, str(val['label']).lower()) for val in value_words]
-                if d and min(d) <= 2:
-                    idx = np.argmin(d)
-                    value_words.pop(idx)
+                if _pop_closest(value_words, keyword, 2):
                     break
         
         elif field_name == 'jenis_kelamin':
             for val in value_words:
-                label_lower = str(val['label']).lower()
+                label_lower = val['label_lower']
                 if levenshtein('laki-laki', label_lower) <= 2:
                     return 'LAKI-LAKI'
                 elif levenshtein('laki', label_lower) <= 1:
@@ -171,14 +271,11 @@ class KTPExtractor:
             return vals[0] if vals else None
         
         elif field_name == 'pekerjaan':
-            d = [levenshtein('kartu', str(val['label']).lower()) for val in value_words]
-            if d and min(d) <= 2:
-                idx = np.argmin(d)
-                value_words.pop(idx)
+            _pop_closest(value_words, 'kartu', 2)
             value_words = [val for val in value_words if val['x1'] <= self.max_x]
         
         elif field_name == 'kewarganegaraan':
-            d = [levenshtein('wni', str(val['label']).lower()) for val in value_words]
+            d = [levenshtein('wni', val['label_lower']) for val in value_words]
             if d:
                 return 'WNI'
             xlocs = [val['x1'] for val in value_words]
@@ -198,10 +295,7 @@ class KTPExtractor:
             return None
         
         elif field_name == 'berlaku_hingga':
-            d = [levenshtein('hingga', str(val['label']).lower()) for val in value_words]
-            if d and min(d) <= 2:
-                idx = np.argmin(d)
-                value_words.pop(idx)
+            _pop_closest(value_words, 'hingga', 2)
             xlocs = [val['x1'] for val in value_words]
             if xlocs:
                 idx = np.argmin(xlocs)
@@ -220,14 +314,13 @@ class KTPExtractor:
             return None
         
         try:
-            
-            regex = re.compile(r'(\d{1,2}-\d{1,2}-\d{4})')
-            tgl = re.findall(regex, date_string)
+
+            tgl = _DATE_RE.findall(date_string)
             if tgl:
                 date = datetime.strptime(tgl[0], '%d-%m-%Y')
             else:
                 
-                tgl = ''.join([n for n in date_string if n.isdigit()])
+                tgl = _NON_DIGIT_RE.sub('', date_string)
                 if len(tgl) == 8:
                     date = datetime.strptime(f"{tgl[0:2]}-{tgl[2:4]}-{tgl[4:]}", '%d-%m-%Y')
                 else:
@@ -275,19 +368,40 @@ class KTPExtractor:
         
         
         self.max_x = 9999
-        
+
         raw_result = {}
-        
-        
+
+
+        # One batched distance computation for all fields x all tokens,
+        # folding the slash-separated keyword variants into their field row
+        tokens = [word['label_lower'] for word in ls_word]
+        keywords = []
+        field_rows = {}
+        for field in self.fields_config:
+            rows = [len(keywords)]
+            keywords.append(field['keywords'])
+            if '/' in field['keywords']:
+                rows.append(len(keywords))
+                keywords.append(field['keywords'].replace('/', ' '))
+            field_rows[field['field_name']] = rows
+
+        max_tolerance = max(field['typo_tolerance'] for field in self.fields_config)
+        dist_matrix = distance_matrix(keywords, tokens, score_cutoff=max_tolerance)
+        coords = word_columns(ls_word)
+
         for field in self.fields_config:
             field_value = self.get_attribute_ktp(
-                ls_word, 
-                field['field_name'], 
-                field['keywords'], 
-                field['typo_tolerance']
+                ls_word,
+                field['field_name'],
+                field['keywords'],
+                field['typo_tolerance'],
+                ls_dist=dist_matrix[field_rows[field['field_name']]].min(axis=0),
+                coords=coords
             )
             if field_value:
-                field_value = str(field_value).replace(': ', '').replace(':', '')
+                # dropping the colon then stripping covers both ': ' and ':'
+                # in one pass over the string
+                field_value = str(field_value).replace(':', '').strip()
             raw_result[field['field_name']] = field_value
         
         return self._process_extracted_data(raw_result)
@@ -297,16 +411,16 @@ class KTPExtractor:
         
         
         if raw_result.get('nik'):
-            data.nik = ''.join([i for i in raw_result['nik'] if i.isdigit()])
-        
-        
+            data.nik = _NON_DIGIT_RE.sub('', raw_result['nik'])
+
+
         if raw_result.get('nama'):
-            data.nama = ''.join([i for i in raw_result['nama'] if not i.isdigit()]).replace('-', '').strip()
+            data.nama = _DIGIT_RE.sub('', raw_result['nama']).replace('-', '').strip()
         
         
         if raw_result.get('jenis_kelamin') == 'LAKI-LAKI':
             data.jenis_kelamin = 'LAKI-LAKI'
-        elif raw_result.get('jenis_kelamin') in ['WANITA', 'PEREMPUAN']:
+        elif raw_result.get('jenis_kelamin') in _FEMALE_LABELS:
             data.jenis_kelamin = 'PEREMPUAN'
         
         
@@ -325,10 +439,9 @@ class KTPExtractor:
         
         if data.tempat_lahir:
             
-            data.tempat_lahir = re.sub(r'[/\\]\s*[TtIi]gl\s*', '', data.tempat_lahir)
-            
-            data.tempat_lahir = ''.join([i for i in data.tempat_lahir if i.isalpha() or i.isspace()])
-            data.tempat_lahir = data.tempat_lahir.strip().upper()
+            data.tempat_lahir = _TGL_RE.sub('', data.tempat_lahir)
+
+            data.tempat_lahir = _NON_ALPHA_SPACE_RE.sub('', data.tempat_lahir).strip().upper()
         
         
         data.kewarganegaraan = 'INDONESIA' if raw_result.get('kewarganegaraan') == 'WNI' else raw_result.get('kewarganegaraan')
@@ -341,7 +454,7 @@ class KTPExtractor:
                 data.status_perkawinan = 'BELUM KAWIN'
             elif levenshtein('kawin', ms_lower) <= 1:
                 data.status_perkawinan = 'KAWIN'
-            elif any(levenshtein(status, ms_lower) <= 2 for status in ['janda', 'duda', 'cerai']):
+            elif any(levenshtein(status, ms_lower) <= 2 for status in _CERAI_STATUSES):
                 data.status_perkawinan = 'CERAI'
         
         
@@ -349,8 +462,8 @@ class KTPExtractor:
         
         
         if raw_result.get('gol_darah'):
-            blood_type = ''.join([i for i in raw_result['gol_darah'] if not i.isdigit()]).strip()
-            data.golongan_darah = blood_type.upper() if blood_type.lower() in ['a', 'b', 'ab', 'o'] else None
+            blood_type = _DIGIT_RE.sub('', raw_result['gol_darah']).strip()
+            data.golongan_darah = blood_type.upper() if blood_type.lower() in _BLOOD_TYPES else None
         
         
         data.provinsi = raw_result.get('provinsi')
@@ -1,59 +1,65 @@
-from google.cloud import vision
 import os
 from config.settings import GOOGLE_CLOUD_CREDENTIALS_PATH
+from app.utils.ocr_cache import OCRResultCache
 
 class OCRService:
     def __init__(self):
+        # Imported here so modules touching this file don't pay the SDK
+        # import when Vision isn't configured
+        from google.cloud import vision
+
         if not os.path.exists(GOOGLE_CLOUD_CREDENTIALS_PATH):
             raise FileNotFoundError(f"GCP credentials not found: {GOOGLE_CLOUD_CREDENTIALS_PATH}")
-        
+
+        self.vision = vision
         self.client = vision.ImageAnnotatorClient.from_service_account_file(
             GOOGLE_CLOUD_CREDENTIALS_PATH
         )
-    
+        self.cache = OCRResultCache(namespace='vision')
+
     def extract_text(self, image_path: str) -> dict:
         try:
             with open(image_path, 'rb') as image_file:
                 content = image_file.read()
-            
-            image = vision.Image(content=content)
-            response = self.client.text_detection(image=image)
-            
-            if response.error.message:
-                raise Exception(f"OCR Error: {response.error.message}")
-            
-            return self._convert_response_to_dict(response)
-        
+
+            return self.extract_text_from_bytes(content)
+
         except Exception as e:
             raise Exception(f"OCR processing failed: {str(e)}")
-    
+
     def extract_text_from_bytes(self, image_bytes: bytes) -> dict:
         try:
-            image = vision.Image(content=image_bytes)
+            cache_key = self.cache.hash_bytes(image_bytes)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            image = self.vision.Image(content=image_bytes)
             response = self.client.text_detection(image=image)
-            
+
             if response.error.message:
                 raise Exception(f"OCR Error: {response.error.message}")
-            
-            return self._convert_response_to_dict(response)
-        
+
+            result = self._convert_response_to_dict(response)
+            self.cache.set(cache_key, result)
+            return result
+
         except Exception as e:
             raise Exception(f"OCR processing failed: {str(e)}")
     
     def _convert_response_to_dict(self, response) -> dict:
         """Convert Google Vision response to expected format"""
-        text_annotations = []
-        
-        for text in response.text_annotations:
-            annotation = {
-                "description": text.description,
-                "boundingPoly": {
-                    "vertices": [
-                        {"x": vertex.x, "y": vertex.y}
-                        for vertex in text.bounding_poly.vertices
-                    ]
+        return {
+            "textAnnotations": [
+                {
+                    "description": text.description,
+                    "boundingPoly": {
+                        "vertices": [
+                            {"x": vertex.x, "y": vertex.y}
+                            for vertex in text.bounding_poly.vertices
+                        ]
+                    }
                 }
-            }
-            text_annotations.append(annotation)
-        
-        return {"textAnnotations": text_annotations}
\ No newline at end of file
+                for text in response.text_annotations
+            ]
+        }
\ No newline at end of file
@@ -1,32 +1,58 @@
-from paddleocr import PaddleOCR
 import cv2
 import numpy as np
 from typing import Dict, List
+from app.utils.ocr_cache import OCRResultCache
+from config.settings import PADDLE_USE_ANGLE_CLS, PADDLE_DET_LIMIT_SIDE_LEN
 
 class PaddleOCRService:
     def __init__(self):
-        self.ocr = PaddleOCR(
-            use_angle_cls=True, 
-            lang='en',  
-            use_gpu=False,
-            show_log=False
-        )
-    
+        # PaddleOCR import + model load take seconds; defer to first use
+        # so startup and health checks stay fast
+        self._ocr = None
+        self.cache = OCRResultCache(namespace='paddle')
+
+    @property
+    def ocr(self):
+        if self._ocr is None:
+            from paddleocr import PaddleOCR
+
+            self._ocr = PaddleOCR(
+                use_angle_cls=PADDLE_USE_ANGLE_CLS,
+                lang='en',
+                use_gpu=False,
+                show_log=False,
+                det_limit_side_len=PADDLE_DET_LIMIT_SIDE_LEN
+            )
+        return self._ocr
+
+    def warmup(self) -> None:
+        """Force the PaddleOCR model to load"""
+        _ = self.ocr
+
     def extract_text(self, image_path: str) -> dict:
         try:
-            result = self.ocr.ocr(image_path, cls=True)
-            return self._convert_to_gcv_format(result[0])
+            with open(image_path, 'rb') as image_file:
+                image_bytes = image_file.read()
+
+            return self.extract_text_from_bytes(image_bytes)
         except Exception as e:
             raise Exception(f"PaddleOCR processing failed: {str(e)}")
-    
+
     def extract_text_from_bytes(self, image_bytes: bytes) -> dict:
         try:
+            cache_key = self.cache.hash_bytes(image_bytes)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             # Convert bytes to numpy array
             nparr = np.frombuffer(image_bytes, np.uint8)
             img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            result = self.ocr.ocr(img, cls=True)
-            return self._convert_to_gcv_format(result[0])
+
+            result = self.ocr.ocr(img, cls=PADDLE_USE_ANGLE_CLS)
+            converted = self._convert_to_gcv_format(result[0])
+            self.cache.set(cache_key, converted)
+            return converted
         except Exception as e:
             raise Exception(f"PaddleOCR processing failed: {str(e)}")
     
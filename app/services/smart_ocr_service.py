@@ -1,4 +1,6 @@
+import hashlib
 import os
+from collections import OrderedDict
 from typing import Dict, Optional
 from app.services.paddle_ocr_service import PaddleOCRService
 
@@ -7,6 +9,11 @@ class SmartOCRService:
         """
         Initialize with dual OCR services: Google Cloud Vision (primary) + PaddleOCR (fallback)
         """
+        # In-process LRU over validated results keyed by image hash, so
+        # repeat submissions skip the whole try-validate-fallback dance
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._cache_max = 256
+
         # Initialize PaddleOCR (always available)
         self.paddle_ocr = PaddleOCRService()
         
@@ -34,43 +41,31 @@ class SmartOCRService:
         """
         Extract text with automatic fallback
         """
-        # Try Google Cloud Vision first (if available)
-        if self.use_google and self.google_ocr:
-            try:
-                print("🔄 Trying Google Cloud Vision...")
-                result = self.google_ocr.extract_text(image_path)
-                
-                # Validate result has meaningful content
-                if self._validate_ocr_result(result):
-                    print("✅ Google Cloud Vision successful")
-                    return result
-                else:
-                    print("⚠️ Google Cloud Vision returned empty result, trying fallback...")
-                    
-            except Exception as e:
-                print(f"❌ Google Cloud Vision failed: {str(e)}")
-                print("🔄 Falling back to PaddleOCR...")
-        
-        # Use PaddleOCR (fallback or primary)
-        try:
-            print("🔄 Using PaddleOCR...")
-            result = self.paddle_ocr.extract_text(image_path)
-            
-            if self._validate_ocr_result(result):
-                print("✅ PaddleOCR successful")
-                return result
-            else:
-                print("⚠️ PaddleOCR returned empty result")
-                return {'textAnnotations': []}
-                
-        except Exception as e:
-            print(f"❌ PaddleOCR failed: {str(e)}")
-            raise Exception(f"All OCR services failed. Last error: {str(e)}")
-    
+        with open(image_path, 'rb') as image_file:
+            image_bytes = image_file.read()
+
+        return self.extract_text_from_bytes(image_bytes)
+
     def extract_text_from_bytes(self, image_bytes: bytes) -> Dict:
         """
         Extract text from bytes with automatic fallback
         """
+        cache_key = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            return cached
+
+        result = self._extract_with_fallback(image_bytes)
+
+        self._cache[cache_key] = result
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+        return result
+
+    def _extract_with_fallback(self, image_bytes: bytes) -> Dict:
         # Try Google Cloud Vision first (if available)
         if self.use_google and self.google_ocr:
             try:
@@ -114,15 +109,26 @@ class SmartOCRService:
         if not annotations:
             return False
         
-        # Check if we have substantial text content
-        total_text = ""
+        # Require at least 10 characters for meaningful content; count
+        # lengths instead of concatenating and stop as soon as the
+        # threshold is crossed (usually on the first annotation)
+        total = 0
         for annotation in annotations:
-            if 'description' in annotation:
-                total_text += annotation['description']
-        
-        # Require at least 10 characters for meaningful content
-        return len(total_text.strip()) >= 10
+            description = annotation.get('description')
+            if description:
+                total += len(description.strip())
+                if total >= 10:
+                    return True
+
+        return False
     
+    def warmup(self) -> Dict:
+        """
+        Force lazy OCR backends to load their models
+        """
+        self.paddle_ocr.warmup()
+        return self.get_service_status()
+
     def get_service_status(self) -> Dict:
         """
         Get status of both OCR services
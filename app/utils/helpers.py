@@ -1,28 +1,59 @@
+import io
 import os
 import uuid
-from PIL import Image
-from config.settings import ALLOWED_EXTENSIONS, MAX_FILE_SIZE
+from config.settings import ALLOWED_EXTENSIONS, MAX_FILE_SIZE, TEMP_DIR
+
+_temp_dir_ready = False
+
+def ensure_temp_dir() -> None:
+    """Create TEMP_DIR on first use instead of at settings import"""
+    global _temp_dir_ready
+    if not _temp_dir_ready:
+        os.makedirs(TEMP_DIR, exist_ok=True)
+        _temp_dir_ready = True
 
 def is_allowed_file(filename: str) -> bool:
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return os.path.splitext(filename)[1][1:].lower() in ALLOWED_EXTENSIONS
 
 def validate_file_size(file_size: int) -> bool:
     return file_size <= MAX_FILE_SIZE
 
 def generate_unique_filename(original_filename: str) -> str:
-    ext = original_filename.rsplit('.', 1)[1].lower()
-    unique_id = str(uuid.uuid4())
-    return f"{unique_id}.{ext}"
+    ext = os.path.splitext(original_filename)[1].lower()
+    return f"{uuid.uuid4()}{ext}"
+
+# Magic numbers for the formats we accept; checking the first header
+# bytes is orders of magnitude cheaper than a full PIL verify
+_IMAGE_MAGIC = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff')
+
+def _deep_validate(fp) -> bool:
+    from PIL import Image
 
-def validate_image(file_path: str) -> bool:
     try:
-        with Image.open(file_path) as img:
+        with Image.open(fp) as img:
             img.verify()
         return True
     except Exception:
         return False
 
+def validate_image(file_path: str, deep: bool = False) -> bool:
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(8)
+    except OSError:
+        return False
+
+    if not head.startswith(_IMAGE_MAGIC):
+        return False
+
+    return _deep_validate(file_path) if deep else True
+
+def validate_image_bytes(image_bytes: bytes, deep: bool = False) -> bool:
+    if not image_bytes.startswith(_IMAGE_MAGIC):
+        return False
+
+    return _deep_validate(io.BytesIO(image_bytes)) if deep else True
+
 def cleanup_temp_file(file_path: str) -> None:
     try:
         if os.path.exists(file_path):
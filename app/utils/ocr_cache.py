@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from config.settings import TEMP_DIR
+
+class OCRResultCache:
+    """
+    Cache OCR results keyed by image content hash.
+
+    Keeps a small in-process LRU plus a write-through JSON copy under
+    TEMP_DIR/ocr_cache so repeat submissions of the same image skip the
+    Vision API call / PaddleOCR inference entirely.
+    """
+
+    def __init__(self, namespace: str, max_entries: int = 256):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.cache_dir = os.path.join(TEMP_DIR, "ocr_cache")
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+
+    @staticmethod
+    def hash_bytes(image_bytes: bytes) -> str:
+        # blake2b is the fastest hash in hashlib and 16 bytes is plenty
+        # for cache keying
+        return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        try:
+            with open(self._cache_path(key), "r") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, result)
+        return result
+
+    def set(self, key: str, result: Dict) -> None:
+        self._remember(key, result)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._cache_path(key), "w") as f:
+                json.dump(result, f)
+        except OSError:
+            # disk cache is best-effort; memory copy is already stored
+            pass
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{self.namespace}_{key}.json")
+
+    def _remember(self, key: str, result: Dict) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
@@ -6,6 +6,11 @@ load_dotenv()
 GOOGLE_CLOUD_CREDENTIALS_PATH = os.getenv("GOOGLE_CLOUD_CREDENTIALS_PATH")
 TEMP_DIR = os.getenv("TEMP_DIR", "temp/")
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 10485760))
-ALLOWED_EXTENSIONS = os.getenv("ALLOWED_EXTENSIONS", "jpg,jpeg,png").split(",")
+ALLOWED_EXTENSIONS = frozenset(
+    ext.strip().lower() for ext in os.getenv("ALLOWED_EXTENSIONS", "jpg,jpeg,png").split(",")
+)
 
-os.makedirs(TEMP_DIR, exist_ok=True)
\ No newline at end of file
+# KTP uploads are upright, so the angle classifier pass is off by default;
+# det_limit_side_len=960 keeps detector cost sane on high-res phone captures
+PADDLE_USE_ANGLE_CLS = os.getenv("PADDLE_USE_ANGLE_CLS", "false").lower() == "true"
+PADDLE_DET_LIMIT_SIDE_LEN = int(os.getenv("PADDLE_DET_LIMIT_SIDE_LEN", 960))
\ No newline at end of file